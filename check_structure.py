@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Check that the compiled structure extraction matches the pure-Python one.
+
+Runs extract_structure and extract_common_list_structure from the built
+libs/_structure extension and from libs/comparison_engine on every request
+and response body in the materials HAR files, and reports any body where
+the results (including key order) differ. Run it after rebuilding the
+extension with:
+    cythonize -i libs/_structure.pyx
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Iterator, List
+from libs.har_parser import parse_har_file
+from libs.comparison_engine import _py_extract_structure, _py_extract_common_list_structure
+from table_generator import find_modules
+
+
+def iter_lists(value: Any) -> Iterator[List[Any]]:
+    """Yield value and every list nested in it, if value is a list or dict."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if type(item) is dict:
+            stack.extend(item.values())
+        elif type(item) is list:
+            yield item
+            stack.extend(item)
+
+
+def iter_bodies(materials_dir: Path) -> Iterator[tuple]:
+    """Yield (label, body) for every non-empty body in the materials HAR files."""
+    for module in sorted(find_modules(materials_dir)):
+        for side in ('legacy', 'nextgen'):
+            har_file = materials_dir / module / side
+            for index, entry in enumerate(parse_har_file(str(har_file))):
+                for part in ('request', 'response'):
+                    body = entry[part]['body']
+                    if body:
+                        yield f"{module}/{side} entry {index} {part}", body
+
+
+def main():
+    """Compare both implementations and exit non-zero on any mismatch."""
+    try:
+        from libs._structure import extract_structure, extract_common_list_structure
+    except ImportError:
+        print("Error: libs/_structure extension is not built (cythonize -i libs/_structure.pyx)", file=sys.stderr)
+        sys.exit(1)
+
+    materials_dir = Path(__file__).parent / 'materials'
+    checked = 0
+    mismatches = 0
+
+    for label, body in iter_bodies(materials_dir):
+        # repr() so dicts with the same items in a different order also differ
+        if repr(extract_structure(body)) != repr(_py_extract_structure(body)):
+            print(f"✗ extract_structure differs: {label}")
+            mismatches += 1
+        for items in iter_lists(body):
+            if repr(extract_common_list_structure(items)) != repr(_py_extract_common_list_structure(items)):
+                print(f"✗ extract_common_list_structure differs: {label}")
+                mismatches += 1
+                break
+        checked += 1
+
+    print(f"Checked {checked} bodies, {mismatches} mismatch(es)")
+    if mismatches or not checked:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
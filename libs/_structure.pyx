@@ -0,0 +1,208 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled structure extraction for libs.comparison_engine.
+
+Same algorithms as the pure-Python extract_structure and
+extract_common_list_structure, with dicts walked via PyDict_Next.
+
+Build in place with:
+    cythonize -i libs/_structure.pyx
+
+libs.comparison_engine falls back to the pure-Python implementations when
+this extension is not built. A built extension is used as is, so after
+changing the pure-Python versions update this file to match, rebuild it and
+run check_structure.py to confirm both give the same results.
+"""
+
+from cpython.dict cimport PyDict_Next
+from cpython.object cimport PyObject
+
+# Same table as comparison_engine._TYPE_NAME (not imported: that module
+# imports this one)
+cdef dict _TYPE_NAME = {
+    dict: 'dict',
+    list: 'list',
+    str: 'str',
+    int: 'int',
+    float: 'float',
+    bool: 'bool',
+    type(None): 'NoneType',
+}
+
+
+cdef object _first_most_common(dict counts):
+    """Return the key with the highest count (ties go to the key seen first)."""
+    cdef Py_ssize_t pos = 0
+    cdef PyObject* key
+    cdef PyObject* count
+    cdef object best = None
+    cdef Py_ssize_t best_count = -1
+    cdef Py_ssize_t current
+    while PyDict_Next(counts, &pos, &key, &count):
+        current = <object>count
+        if current > best_count:
+            best_count = current
+            best = <object>key
+    return best
+
+
+cdef inline object _type_name(object value_type):
+    """Return the structure name of a type, avoiding __name__ for JSON types."""
+    name = _TYPE_NAME.get(value_type)
+    if name is None:
+        return value_type.__name__
+    return name
+
+
+cpdef object extract_structure(object obj):
+    """
+    Extract structural representation of a JSON object, ignoring values.
+
+    Args:
+        obj: JSON object to extract structure from
+
+    Returns:
+        Structural representation (types, keys, nested structures)
+    """
+    # Each work item fills parent[slot] with the structure of value
+    cdef list root = [None]
+    cdef list stack = [(obj, root, 0)]
+    cdef object value, parent, slot
+    cdef dict structure
+    cdef list nested
+    cdef Py_ssize_t pos
+    cdef PyObject* key
+    cdef PyObject* item
+
+    while stack:
+        value, parent, slot = stack.pop()
+
+        if value is None:
+            parent[slot] = "NoneType"
+        elif isinstance(value, dict):
+            # Extract keys and structure of values (slots reserved to keep key order)
+            structure = dict.fromkeys(value)
+            parent[slot] = structure
+            pos = 0
+            while PyDict_Next(value, &pos, &key, &item):
+                stack.append((<object>item, structure, <object>key))
+        elif isinstance(value, list):
+            # Extract structure of first item (if list is non-empty), ignore length
+            if len(<list>value) > 0:
+                nested = [None]
+                parent[slot] = nested
+                stack.append(((<list>value)[0], nested, 0))
+            else:
+                parent[slot] = []
+        else:
+            # For primitives, store the type name only (not the value)
+            parent[slot] = _type_name(type(value))
+
+    return root[0]
+
+
+cdef void _common_structure_step(object items, object parent, object slot, list stack) except *:
+    """
+    Compute one level of extract_common_list_structure.
+
+    Stores the common structure of items in parent[slot] and pushes nested
+    dict/list values onto stack, like the pure-Python version.
+    """
+    cdef dict type_counts = {}
+    cdef dict key_structures
+    cdef dict value_type_counts
+    cdef dict common_structure
+    cdef list most_common_items, values, same_type_values, all_nested_items, nested
+    cdef object item_type, most_common_type, most_common_value_type
+    cdef object item, value
+    cdef double majority_threshold
+    cdef Py_ssize_t pos
+    cdef PyObject* key
+    cdef PyObject* entry
+
+    if len(items) == 0:
+        parent[slot] = []
+        return
+
+    # Count type occurrences
+    for item in items:
+        item_type = type(item)
+        type_counts[item_type] = type_counts.get(item_type, 0) + 1
+
+    # Find most common type (ties go to the type seen first)
+    most_common_type = _first_most_common(type_counts)
+    most_common_items = [item for item in items if type(item) is most_common_type]
+
+    # Extract structure based on most common type
+    if most_common_type is dict:
+        # For dictionaries, find keys present in majority of items
+        key_structures = {}
+        for item in most_common_items:
+            pos = 0
+            while PyDict_Next(item, &pos, &key, &entry):
+                values = key_structures.get(<object>key)
+                if values is None:
+                    values = []
+                    key_structures[<object>key] = values
+                values.append(<object>entry)
+
+        # Include keys present in majority (more than 50%)
+        majority_threshold = len(most_common_items) / 2
+        common_structure = {}
+        parent[slot] = common_structure
+
+        pos = 0
+        while PyDict_Next(key_structures, &pos, &key, &entry):
+            values = <list>entry
+            if len(values) > majority_threshold:
+                # Use the most common value type (ties go to the type seen first)
+                value_type_counts = {}
+                for value in values:
+                    item_type = type(value)
+                    value_type_counts[item_type] = value_type_counts.get(item_type, 0) + 1
+                most_common_value_type = _first_most_common(value_type_counts)
+
+                if most_common_value_type is dict or most_common_value_type is list:
+                    # Extract common structure for nested dicts/lists later (slot reserved to keep key order)
+                    same_type_values = [value for value in values if type(value) is most_common_value_type]
+                    common_structure[<object>key] = None
+                    stack.append((same_type_values, common_structure, <object>key))
+                else:
+                    # For primitives, just use the type name
+                    common_structure[<object>key] = _type_name(most_common_value_type)
+
+    elif most_common_type is list:
+        # For nested lists, extract common structure of all their items
+        all_nested_items = []
+        for item in most_common_items:
+            all_nested_items.extend(item)
+
+        if len(all_nested_items) > 0:
+            nested = [None]
+            parent[slot] = nested
+            stack.append((all_nested_items, nested, 0))
+        else:
+            parent[slot] = []
+
+    else:
+        # For primitives, store the type name
+        parent[slot] = _type_name(most_common_type)
+
+
+cpdef object extract_common_list_structure(object items):
+    """
+    Extract the common structure from a list of items using majority approach.
+
+    Args:
+        items: List of items to analyze
+
+    Returns:
+        Common structural representation of the list items
+    """
+    cdef list root = [None]
+    cdef list stack = [(items, root, 0)]
+    cdef object level_items, parent, slot
+    while stack:
+        level_items, parent, slot = stack.pop()
+        _common_structure_step(level_items, parent, slot, stack)
+    return root[0]
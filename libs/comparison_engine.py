@@ -1,124 +1,184 @@
 """API comparison engine for comparing legacy and nextgen APIs."""
 
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Set, Tuple
 from libs.har_parser import group_apis_by_name, parse_har_file
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse, parse_qsl
 import json
 
 
+# Endpoint pairs sent to a worker per task when compare_apis runs with jobs > 1
+COMPARE_CHUNK_SIZE = 16
+
+# Marks a deep_compare_json work item that emits an already computed difference
+_EMIT = object()
+
+# Structure names of JSON value types; type(x).__name__ builds a new string
+# on every access, so known types are looked up here first
+_TYPE_NAME = {
+    dict: 'dict',
+    list: 'list',
+    str: 'str',
+    int: 'int',
+    float: 'float',
+    bool: 'bool',
+    type(None): 'NoneType',
+}
+
+
 def extract_structure(obj: Any) -> Any:
     """
     Extract structural representation of a JSON object, ignoring values.
     
+    Walks the object with an explicit stack rather than recursion, so deeply
+    nested bodies cannot hit the recursion limit.
+    
     Args:
         obj: JSON object to extract structure from
         
     Returns:
         Structural representation (types, keys, nested structures)
     """
-    if obj is None:
-        return "NoneType"
+    # Each work item fills parent[slot] with the structure of value
+    root: List[Any] = [None]
+    stack = [(obj, root, 0)]
     
-    if isinstance(obj, dict):
-        # Extract keys and recursively extract structure of values
-        return {key: extract_structure(value) for key, value in obj.items()}
-    
-    if isinstance(obj, list):
-        # Extract structure of first item (if list is non-empty), ignore length
-        if len(obj) > 0:
-            return [extract_structure(obj[0])]
+    while stack:
+        value, parent, slot = stack.pop()
+        
+        if value is None:
+            parent[slot] = "NoneType"
+        elif isinstance(value, dict):
+            # Extract keys and structure of values (slots reserved to keep key order)
+            structure = dict.fromkeys(value)
+            parent[slot] = structure
+            for key, item in value.items():
+                stack.append((item, structure, key))
+        elif isinstance(value, list):
+            # Extract structure of first item (if list is non-empty), ignore length
+            if len(value) > 0:
+                structure = [None]
+                parent[slot] = structure
+                stack.append((value[0], structure, 0))
+            else:
+                parent[slot] = []
         else:
-            return []
+            # For primitives, store the type name only (not the value)
+            value_type = type(value)
+            parent[slot] = _TYPE_NAME.get(value_type) or value_type.__name__
     
-    # For primitives, return the type name only (not the value)
-    return type(obj).__name__
+    return root[0]
 
 
-def extract_common_list_structure(items: List[Any]) -> Any:
+def _common_structure_step(items: List[Any], parent: Any, slot: Any, stack: List[Tuple[List[Any], Any, Any]]) -> None:
     """
-    Extract the common structure from a list of items using majority approach.
-    Analyzes all items to find the most common type and structure.
+    Compute one level of extract_common_list_structure.
     
-    Args:
-        items: List of items to analyze
-        
-    Returns:
-        Common structural representation of the list items
+    Stores the common structure of items in parent[slot]. Nested dict/list
+    values are not descended into; their slots are reserved and pushed onto
+    stack for the caller to process.
     """
     if len(items) == 0:
-        return []
+        parent[slot] = []
+        return
     
     # Count type occurrences
-    type_counts: Dict[str, int] = {}
-    type_items: Dict[str, List[Any]] = {}
+    type_counts = Counter(map(type, items))
     
-    for item in items:
-        item_type = type(item).__name__
-        type_counts[item_type] = type_counts.get(item_type, 0) + 1
-        if item_type not in type_items:
-            type_items[item_type] = []
-        type_items[item_type].append(item)
-    
-    # Find most common type
-    most_common_type = max(type_counts.items(), key=lambda x: x[1])[0]
-    most_common_items = type_items[most_common_type]
+    # Find most common type (ties go to the type seen first)
+    most_common_type = type_counts.most_common(1)[0][0]
+    most_common_items = [item for item in items if type(item) is most_common_type]
     
     # Extract structure based on most common type
-    if most_common_type == 'dict':
+    if most_common_type is dict:
         # For dictionaries, find keys present in majority of items
-        key_counts: Dict[str, int] = {}
-        key_structures: Dict[str, List[Any]] = {}
+        key_structures: Dict[str, List[Any]] = defaultdict(list)
         
         for item in most_common_items:
             for key, value in item.items():
-                key_counts[key] = key_counts.get(key, 0) + 1
-                if key not in key_structures:
-                    key_structures[key] = []
                 key_structures[key].append(value)
         
         # Include keys present in majority (more than 50%)
         majority_threshold = len(most_common_items) / 2
         common_structure = {}
+        parent[slot] = common_structure
         
-        for key, count in key_counts.items():
-            if count > majority_threshold:
-                # Extract common structure for this key's values
-                values = key_structures[key]
-                if len(values) > 0:
-                    # If all values have same type, use that structure
-                    value_types = [type(v).__name__ for v in values]
-                    most_common_value_type = max(set(value_types), key=value_types.count)
-                    
+        for key, values in key_structures.items():
+            if len(values) > majority_threshold:
+                # Extract common structure for this key's values using
+                # the most common value type (ties go to the type seen first)
+                value_type_counts = Counter(map(type, values))
+                most_common_value_type = value_type_counts.most_common(1)[0][0]
+                
+                if most_common_value_type is dict or most_common_value_type is list:
                     # Get items with most common value type
-                    same_type_values = [v for v in values if type(v).__name__ == most_common_value_type]
-                    
-                    if most_common_value_type == 'dict':
-                        # Recursively extract common structure for nested dicts
-                        common_structure[key] = extract_common_list_structure(same_type_values)
-                    elif most_common_value_type == 'list':
-                        # Extract common structure for nested lists
-                        common_structure[key] = extract_common_list_structure(same_type_values)
-                    else:
-                        # For primitives, just use the type
-                        common_structure[key] = most_common_value_type
-        
-        return common_structure
-    
-    elif most_common_type == 'list':
-        # For nested lists, extract common structure recursively
+                    same_type_values = [v for v in values if type(v) is most_common_value_type]
+                    # Extract common structure for nested dicts/lists later (slot reserved to keep key order)
+                    common_structure[key] = None
+                    stack.append((same_type_values, common_structure, key))
+                else:
+                    # For primitives, just use the type name
+                    common_structure[key] = _TYPE_NAME.get(most_common_value_type) or most_common_value_type.__name__
+    
+    elif most_common_type is list:
+        # For nested lists, extract common structure of all their items
         # Flatten and analyze all items from all lists
         all_nested_items = []
         for item in most_common_items:
             all_nested_items.extend(item)
         
         if len(all_nested_items) > 0:
-            return [extract_common_list_structure(all_nested_items)]
+            nested_structure = [None]
+            parent[slot] = nested_structure
+            stack.append((all_nested_items, nested_structure, 0))
         else:
-            return []
+            parent[slot] = []
     
     else:
-        # For primitives, return the type name
-        return most_common_type
+        # For primitives, store the type name
+        parent[slot] = _TYPE_NAME.get(most_common_type) or most_common_type.__name__
+
+
+def extract_common_list_structure(items: List[Any]) -> Any:
+    """
+    Extract the common structure from a list of items using majority approach.
+    Analyzes all items to find the most common type and structure.
+    
+    Nested levels are processed from an explicit stack rather than by
+    recursion.
+    
+    Args:
+        items: List of items to analyze
+        
+    Returns:
+        Common structural representation of the list items
+    """
+    root: List[Any] = [None]
+    stack = [(items, root, 0)]
+    while stack:
+        level_items, parent, slot = stack.pop()
+        _common_structure_step(level_items, parent, slot, stack)
+    return root[0]
+
+
+# Pure-Python implementations, kept so check_structure.py can compare the
+# compiled ones against them
+_py_extract_structure = extract_structure
+_py_extract_common_list_structure = extract_common_list_structure
+
+# Prefer the compiled versions when built (cythonize -i libs/_structure.pyx).
+# libs/_structure.pyx duplicates the functions above and is not rebuilt
+# automatically: after changing them, update the .pyx, rebuild it and run
+# check_structure.py.
+try:
+    from libs._structure import (
+        extract_structure,
+        extract_common_list_structure,
+    )
+except ImportError:
+    pass
 
 
 def deep_compare_json(obj1: Any, obj2: Any, path: str = "") -> List[Dict[str, Any]]:
@@ -126,6 +186,9 @@ def deep_compare_json(obj1: Any, obj2: Any, path: str = "") -> List[Dict[str, An
     Deeply compare two JSON objects by structure (schema) and return list of differences.
     Compares field names, types, and nested structures while ignoring example values.
     
+    The objects are walked with an explicit stack rather than recursion.
+    Differences are reported in the same depth-first order as a recursive walk.
+    
     Args:
         obj1: First object to compare
         obj2: Second object to compare
@@ -135,113 +198,116 @@ def deep_compare_json(obj1: Any, obj2: Any, path: str = "") -> List[Dict[str, An
         List of differences with type, path, and values
     """
     differences = []
-    
-    # Type mismatch
-    if type(obj1) != type(obj2):
-        differences.append({
-            'type': 'type_mismatch',
-            'path': path or 'root',
-            'legacy': type(obj1).__name__,
-            'nextgen': type(obj2).__name__,
-            'legacy_value': obj1,
-            'nextgen_value': obj2
-        })
-        return differences
-    
-    # Compare dictionaries
-    if isinstance(obj1, dict):
-        all_keys = set(obj1.keys()) | set(obj2.keys())
-        for key in all_keys:
-            new_path = f"{path}.{key}" if path else key
-            if key not in obj1:
-                differences.append({
-                    'type': 'added',
-                    'path': new_path,
-                    'nextgen_value': obj2[key]
-                })
-            elif key not in obj2:
-                differences.append({
+    append = differences.append
+    
+    # Work items are (obj1, obj2, path) comparisons, or (_EMIT, diff, None) to
+    # emit an already computed difference once the items before it are done
+    stack = [(obj1, obj2, path)]
+    pop = stack.pop
+    push = stack.append
+    
+    while stack:
+        a, b, p = pop()
+        if a is _EMIT:
+            append(b)
+            continue
+        
+        # The same object has the same structure; skip the whole subtree
+        if a is b:
+            continue
+        
+        # Type mismatch
+        if type(a) != type(b):
+            append({
+                'type': 'type_mismatch',
+                'path': p or 'root',
+                'legacy': type(a).__name__,
+                'nextgen': type(b).__name__,
+                'legacy_value': a,
+                'nextgen_value': b
+            })
+            continue
+        
+        # Compare dictionaries
+        if isinstance(a, dict):
+            # Each key is visited once: legacy keys are either shared
+            # (compare nested structures) or removed, then nextgen-only
+            # keys are added. Differences follow legacy then nextgen key order.
+            pending = []
+            for key, value in a.items():
+                new_path = f"{p}.{key}" if p else key
+                if key in b:
+                    pending.append((value, b[key], new_path))
+                else:
+                    pending.append((_EMIT, {
+                        'type': 'removed',
+                        'path': new_path,
+                        'legacy_value': value
+                    }, None))
+            for key, value in b.items():
+                if key not in a:
+                    pending.append((_EMIT, {
+                        'type': 'added',
+                        'path': f"{p}.{key}" if p else key,
+                        'nextgen_value': value
+                    }, None))
+            # Push in reverse so items are handled in key order
+            stack.extend(reversed(pending))
+        
+        # Compare lists - ignore length, compare item structure only
+        elif isinstance(a, list):
+            # Ignore list length differences (length is variable in examples)
+            # Extract common structure from all items, then compare
+            item_path = f"{p}[*]" if p else "[*]"
+            if len(a) > 0 and len(b) > 0:
+                # Both lists have items - extract common structure and compare
+                push((extract_common_list_structure(a), extract_common_list_structure(b), item_path))
+            elif len(a) > 0 and len(b) == 0:
+                # Legacy has items, nextgen is empty - report that array structure was removed
+                # Extract common structure to show what was removed
+                append({
                     'type': 'removed',
-                    'path': new_path,
-                    'legacy_value': obj1[key]
+                    'path': item_path,
+                    'legacy_value': extract_common_list_structure(a)
                 })
-            else:
-                # Recursively compare nested structures
-                differences.extend(deep_compare_json(obj1[key], obj2[key], new_path))
-    
-    # Compare lists - ignore length, compare item structure only
-    elif isinstance(obj1, list):
-        # Ignore list length differences (length is variable in examples)
-        # Extract common structure from all items, then compare
-        if len(obj1) > 0 and len(obj2) > 0:
-            # Both lists have items - extract common structure and compare
-            item_path = f"{path}[*]" if path else "[*]"
-            common_struct1 = extract_common_list_structure(obj1)
-            common_struct2 = extract_common_list_structure(obj2)
-            differences.extend(deep_compare_json(common_struct1, common_struct2, item_path))
-        elif len(obj1) > 0 and len(obj2) == 0:
-            # Legacy has items, nextgen is empty - report that array structure was removed
-            item_path = f"{path}[*]" if path else "[*]"
-            # Extract common structure to show what was removed
-            struct = extract_common_list_structure(obj1)
-            differences.append({
-                'type': 'removed',
-                'path': item_path,
-                'legacy_value': struct
-            })
-        elif len(obj1) == 0 and len(obj2) > 0:
-            # Legacy is empty, nextgen has items - report that array structure was added
-            item_path = f"{path}[*]" if path else "[*]"
-            # Extract common structure to show what was added
-            struct = extract_common_list_structure(obj2)
-            differences.append({
-                'type': 'added',
-                'path': item_path,
-                'nextgen_value': struct
-            })
-        # If both are empty, no differences (same structure)
-    
-    # Compare primitive values - only report type mismatches, ignore value differences
-    else:
-        # Types already match (checked above), so no difference for structure comparison
-        # Values are ignored for structure comparison
-        pass
+            elif len(a) == 0 and len(b) > 0:
+                # Legacy is empty, nextgen has items - report that array structure was added
+                # Extract common structure to show what was added
+                append({
+                    'type': 'added',
+                    'path': item_path,
+                    'nextgen_value': extract_common_list_structure(b)
+                })
+            # If both are empty, no differences (same structure)
+        
+        # Primitive values: types already match (checked above), and values
+        # are ignored for structure comparison
     
     return differences
 
 
-def _strip_content_disposition_filename(value: str) -> str:
-    """
-    Remove filename-related parameters from a Content-Disposition header value.
-    This lets us ignore differences where only the filename changes.
-    """
-    parts = [p.strip() for p in value.split(';')]
-    filtered = []
-    for part in parts:
-        lower = part.lower()
-        if lower.startswith('filename=') or lower.startswith('filename*='):
-            continue
-        if part:
-            filtered.append(part)
-    return '; '.join(filtered)
+# Header parameters ignored when comparing header values
+_FILENAME_PARAMS = ('filename=', 'filename*=')
+_BOUNDARY_PARAMS = ('boundary=',)
 
 
-def _strip_multipart_boundary(value: str) -> str:
+@lru_cache(maxsize=1024)
+def _strip_header_params(value: str, drop: Tuple[str, ...]) -> str:
     """
-    Remove boundary parameter from a Content-Type header value when it's multipart/form-data.
-    This lets us ignore differences where only the boundary changes.
+    Remove parameters whose name starts with one of the drop prefixes from a header value.
+    
+    Used to ignore differences where only a Content-Disposition filename or
+    a multipart/form-data Content-Type boundary changes.
     """
-    parts = [p.strip() for p in value.split(';')]
-    filtered = []
-    for part in parts:
-        lower = part.lower()
-        if lower.startswith('boundary='):
-            continue
-        if part:
-            filtered.append(part)
-    return '; '.join(filtered)
+    kept = []
+    for part in value.split(';'):
+        part = part.strip()
+        if part and not part.lower().startswith(drop):
+            kept.append(part)
+    return '; '.join(kept)
 
 
+@lru_cache(maxsize=4096)
 def extract_url_path(url: str) -> str:
     """
     Extract path from URL, ignoring hostname and schema.
@@ -252,6 +318,11 @@ def extract_url_path(url: str) -> str:
     Returns:
         Path with query string if present, otherwise just the path
     """
+    # A bare path is returned as is unless urlparse would change it
+    # (network-path reference, params, fragment, empty query or control chars)
+    if (url.startswith('/') and not url.startswith('//') and url.isprintable()
+            and '#' not in url and ';' not in url and not url.endswith('?')):
+        return url
     parsed = urlparse(url)
     # Return path with query string if present
     if parsed.query:
@@ -271,10 +342,8 @@ def normalize_url_with_param_keys(url: str) -> str:
     """
     parsed = urlparse(url)
     if parsed.query:
-        # Parse query parameters and extract only keys
-        params = parse_qs(parsed.query, keep_blank_values=True)
-        # Sort keys for consistent comparison
-        param_keys = sorted(params.keys())
+        # Parse query parameters and extract only keys (unique, sorted for consistent comparison)
+        param_keys = sorted({key for key, _ in parse_qsl(parsed.query, keep_blank_values=True)})
         # Create normalized query string with only keys
         normalized_query = '&'.join(param_keys)
         return f"{parsed.path}?{normalized_query}"
@@ -310,33 +379,37 @@ def compare_headers(
     ignore_content_disposition_filename: bool = False,
 ) -> Dict[str, Any]:
     """Compare two header dictionaries."""
-    all_keys = set(headers1.keys()) | set(headers2.keys())
-    
-    added = {k: headers2[k] for k in all_keys if k not in headers1}
-    removed = {k: headers1[k] for k in all_keys if k not in headers2}
+    # Unchanged headers are common between matched endpoints; dict == is a
+    # single C-level comparison
+    if headers1 is headers2 or headers1 == headers2:
+        return {'added': {}, 'removed': {}, 'modified': {}, 'identical': True}
+
+    # Each dict is walked once; results follow header order
+    added = {k: v for k, v in headers2.items() if k not in headers1}
+    removed = {k: v for k, v in headers1.items() if k not in headers2}
     modified = {}
     
-    for key in all_keys:
-        if key in headers1 and key in headers2:
-            if headers1[key] != headers2[key]:
+    for key, value1 in headers1.items():
+        if key in headers2:
+            value2 = headers2[key]
+            if value1 != value2:
+                lower_key = key.lower()
                 # Ignore Content-Disposition filename differences if requested
-                if ignore_content_disposition_filename and key.lower() == 'content-disposition':
-                    normalized1 = _strip_content_disposition_filename(headers1[key])
-                    normalized2 = _strip_content_disposition_filename(headers2[key])
+                if ignore_content_disposition_filename and lower_key == 'content-disposition':
+                    normalized1 = _strip_header_params(value1, _FILENAME_PARAMS)
+                    normalized2 = _strip_header_params(value2, _FILENAME_PARAMS)
                     if normalized1 == normalized2:
                         continue
                 # Ignore Content-Type boundary differences for multipart/form-data
-                if key.lower() == 'content-type':
-                    value1_lower = headers1[key].lower()
-                    value2_lower = headers2[key].lower()
-                    if 'multipart/form-data' in value1_lower and 'multipart/form-data' in value2_lower:
-                        normalized1 = _strip_multipart_boundary(headers1[key])
-                        normalized2 = _strip_multipart_boundary(headers2[key])
+                if lower_key == 'content-type':
+                    if 'multipart/form-data' in value1.lower() and 'multipart/form-data' in value2.lower():
+                        normalized1 = _strip_header_params(value1, _BOUNDARY_PARAMS)
+                        normalized2 = _strip_header_params(value2, _BOUNDARY_PARAMS)
                         if normalized1 == normalized2:
                             continue
                 modified[key] = {
-                    'legacy': headers1[key],
-                    'nextgen': headers2[key]
+                    'legacy': value1,
+                    'nextgen': value2
                 }
     
     return {
@@ -402,13 +475,22 @@ def compare_response_structures(legacy_entry: Dict[str, Any], nextgen_entry: Dic
     }
 
 
-def compare_apis(legacy_file: str, nextgen_file: str) -> Dict[str, Any]:
+def _compare_pair(pair: Tuple[Dict[str, Any], Dict[str, Any]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Compare one (legacy, nextgen) entry pair; runs in a worker process when jobs > 1."""
+    legacy_entry, nextgen_entry = pair
+    request_diff = compare_request_structures(legacy_entry, nextgen_entry)
+    response_diff = compare_response_structures(legacy_entry, nextgen_entry)
+    return request_diff, response_diff
+
+
+def compare_apis(legacy_file: str, nextgen_file: str, jobs: int = 1) -> Dict[str, Any]:
     """
     Compare APIs between legacy and nextgen HAR files using name-based matching.
     
     Args:
         legacy_file: Path to legacy HAR file
         nextgen_file: Path to nextgen HAR file
+        jobs: Number of worker processes used to compare endpoints
         
     Returns:
         Dictionary containing comparison results
@@ -421,22 +503,25 @@ def compare_apis(legacy_file: str, nextgen_file: str) -> Dict[str, Any]:
     legacy_grouped = group_apis_by_name(legacy_entries)
     nextgen_grouped = group_apis_by_name(nextgen_entries)
     
-    all_keys = set(legacy_grouped.keys()) | set(nextgen_grouped.keys())
-    
-    # Categorize keys
-    common_keys = set(legacy_grouped.keys()) & set(nextgen_grouped.keys())
-    legacy_only = set(legacy_grouped.keys()) - set(nextgen_grouped.keys())
-    nextgen_only = set(nextgen_grouped.keys()) - set(legacy_grouped.keys())
+    # Categorize keys (set operations directly on the key views)
+    legacy_keys = legacy_grouped.keys()
+    nextgen_keys = nextgen_grouped.keys()
+    common_keys = legacy_keys & nextgen_keys
+    legacy_only = legacy_keys - nextgen_keys
+    nextgen_only = nextgen_keys - legacy_keys
+    
+    # Compare common keys (first occurrence of each name); endpoints are
+    # independent, so they can be compared in worker processes
+    common_key_list = list(common_keys)
+    pairs = [(legacy_grouped[key][0], nextgen_grouped[key][0]) for key in common_key_list]
+    if jobs > 1 and len(pairs) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(_compare_pair, pairs, chunksize=COMPARE_CHUNK_SIZE))
+    else:
+        results = [_compare_pair(pair) for pair in pairs]
     
-    # Compare common keys
     key_comparisons = {}
-    for key in common_keys:
-        legacy_entry = legacy_grouped[key][0]  # Use first occurrence
-        nextgen_entry = nextgen_grouped[key][0]  # Use first occurrence
-        
-        request_diff = compare_request_structures(legacy_entry, nextgen_entry)
-        response_diff = compare_response_structures(legacy_entry, nextgen_entry)
-        
+    for key, (legacy_entry, nextgen_entry), (request_diff, response_diff) in zip(common_key_list, pairs, results):
         key_comparisons[key] = {
             'request': request_diff,
             'response': response_diff,
@@ -1,93 +1,212 @@
 """Report generator for API comparison results."""
 
-from typing import Dict, Any, List
+import json
+import math
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 
-def format_json_value(value: Any, indent: int = 0) -> str:
-    """Format JSON value for markdown display."""
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Shared encoders; json.dumps would build a new JSONEncoder on every call
+_INDENT_ENCODER = json.JSONEncoder(indent=2)
+_COMPACT_ENCODER = json.JSONEncoder(separators=(',', ':'))
+
+# Maximum number of rendered flat string-valued dicts (e.g. headers) kept by
+# format_json_value; equal ones recur across endpoints
+JSON_CACHE_SIZE = 1024
+
+# Container types rendered as JSON blocks, mapped to their empty-value markup
+_EMPTY_JSON_CONTAINERS = {dict: "`{}`", list: "`[]`"}
+
+# Containers with at most this many scalar items, serializing to at most
+# _INLINE_JSON_MAX_LENGTH characters, are rendered as one inline code span
+_INLINE_JSON_MAX_ITEMS = 2
+_INLINE_JSON_MAX_LENGTH = 100
+
+
+def format_json_value(value: Any, indent: int = 0, compact: bool = False) -> str:
+    """
+    Format JSON value for markdown display.
+
+    Args:
+        value: Value to format
+        indent: Unused, kept for backward compatibility
+        compact: If True, serialize dicts/lists without indentation. This lets
+            the json module use its C encoder, which is much faster for large
+            bodies than the pure-Python indented path.
+
+    Returns:
+        Markdown formatted value
+    """
     if value is None:
         return "`null`"
-    if isinstance(value, dict):
-        if not value:
-            return "`{}`"
-        lines = ["```json"]
-        import json
-        lines.append(json.dumps(value, indent=2))
-        lines.append("```")
-        return "\n".join(lines)
-    if isinstance(value, list):
+    if type(value) is dict and value and _is_str_dict(value):
+        return _format_str_dict_block(tuple(value.items()), compact)
+    return _format_json_block(value, compact)
+
+
+@lru_cache(maxsize=JSON_CACHE_SIZE)
+def _format_str_dict_block(items: Tuple[Tuple[str, str], ...], compact: bool) -> str:
+    """Format a flat str -> str dict given as its items, caching by content."""
+    return _format_json_block(dict(items), compact)
+
+
+def _dump_json(value: Any, compact: bool) -> str:
+    """
+    Serialize value to JSON text, using orjson when it is installed.
+    
+    Falls back to the stdlib encoders when orjson rejects the value (e.g.
+    integers wider than 64 bits), the output contains non-ASCII text or DEL
+    (0x7f), so such characters stay \\u-escaped as with json.dumps, or the
+    value holds NaN/Infinity, which orjson would write as null.
+    """
+    if orjson is not None:
+        try:
+            if compact:
+                dumped = orjson.dumps(value)
+            else:
+                dumped = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+        else:
+            if (dumped.isascii() and b'\x7f' not in dumped
+                    and not (b'null' in dumped and _has_non_finite_float(value))):
+                return dumped.decode()
+    if not compact and type(value) is dict and value and _is_str_dict(value):
+        return _dump_str_dict_indented(value)
+    encoder = _COMPACT_ENCODER if compact else _INDENT_ENCODER
+    return encoder.encode(value)
+
+
+def _has_non_finite_float(value: Any) -> bool:
+    """Return True if value contains a NaN or infinite float at any depth."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if type(item) is dict:
+            stack.extend(item.values())
+        elif type(item) is list:
+            stack.extend(item)
+        elif type(item) is float and not math.isfinite(item):
+            return True
+    return False
+
+
+def _is_str_dict(value: Dict[Any, Any]) -> bool:
+    """Return True if all keys and values of value are strings."""
+    return all(type(k) is str and type(v) is str for k, v in value.items())
+
+
+def _dump_str_dict_indented(value: Dict[str, str]) -> str:
+    """
+    Serialize a non-empty str -> str dict (e.g. headers) like json.dumps(indent=2).
+    
+    The stdlib indented encoder runs in pure Python; for this flat shape
+    escaping each string with the C helper and joining is much faster.
+    """
+    body = ",\n".join([
+        f"  {encode_basestring_ascii(k)}: {encode_basestring_ascii(v)}"
+        for k, v in value.items()
+    ])
+    return f"{{\n{body}\n}}"
+
+
+def _format_inline_json(value: Any) -> Optional[str]:
+    """
+    Render a small scalar-only dict/list as `{"k":"v"}`, or None if it does not fit.
+    
+    Inline spans still go through the cell markdown pass, so text containing
+    a backtick or ** is left to the fenced block, which is shown verbatim.
+    """
+    items = value.values() if type(value) is dict else value
+    if any(type(item) in _EMPTY_JSON_CONTAINERS for item in items):
+        return None
+    dumped = _dump_json(value, compact=True)
+    if len(dumped) > _INLINE_JSON_MAX_LENGTH or '`' in dumped or '**' in dumped:
+        return None
+    return f"`{dumped}`"
+
+
+def _format_json_block(value: Any, compact: bool) -> str:
+    """Format JSON value for markdown display without caching."""
+    empty = _EMPTY_JSON_CONTAINERS.get(type(value))
+    if empty is not None:
         if not value:
-            return "`[]`"
-        lines = ["```json"]
-        import json
-        lines.append(json.dumps(value, indent=2))
-        lines.append("```")
-        return "\n".join(lines)
-    if isinstance(value, str):
+            return empty
+        if len(value) <= _INLINE_JSON_MAX_ITEMS:
+            inline = _format_inline_json(value)
+            if inline is not None:
+                return inline
+        return f"```json\n{_dump_json(value, compact)}\n```"
+    if type(value) is str:
         if len(value) > 100:
             return f"`{value[:100]}...` (truncated)"
         return f"`{value}`"
     return f"`{value}`"
 
 
-def format_differences(differences: List[Dict[str, Any]]) -> str:
-    """Format list of differences for display."""
-    if not differences:
-        return "No differences"
-    
-    lines = []
+def _iter_difference_blocks(differences: List[Dict[str, Any]], compact_json: bool) -> Iterator[str]:
+    """Yield one preformatted markdown block per difference."""
     for diff in differences:
         diff_type = diff.get('type', 'unknown')
         path = diff.get('path', 'unknown')
         
         if diff_type == 'added':
-            lines.append(f"- **Added** at `{path}`:")
-            lines.append(f"{format_json_value(diff.get('nextgen_value'))}")
+            yield (f"- **Added** at `{path}`:\n"
+                   f"{format_json_value(diff.get('nextgen_value'), compact=compact_json)}")
         elif diff_type == 'removed':
-            lines.append(f"- **Removed** at `{path}`:")
-            lines.append(f"{format_json_value(diff.get('legacy_value'))}")
+            yield (f"- **Removed** at `{path}`:\n"
+                   f"{format_json_value(diff.get('legacy_value'), compact=compact_json)}")
         elif diff_type == 'modified':
-            lines.append(f"- **Modified** at `{path}`:")
-            lines.append(f"  - Legacy:")
-            lines.append(f"{format_json_value(diff.get('legacy_value'))}")
-            lines.append(f"  - Nextgen:")
-            lines.append(f"{format_json_value(diff.get('nextgen_value'))}")
+            yield (f"- **Modified** at `{path}`:\n"
+                   f"  - Legacy:\n"
+                   f"{format_json_value(diff.get('legacy_value'), compact=compact_json)}\n"
+                   f"  - Nextgen:\n"
+                   f"{format_json_value(diff.get('nextgen_value'), compact=compact_json)}")
         elif diff_type == 'type_mismatch':
-            lines.append(f"- **Type mismatch** at `{path}`:")
-            lines.append(f"  - Legacy type: `{diff.get('legacy')}`")
-            lines.append(f"  - Nextgen type: `{diff.get('nextgen')}`")
-    
-    return "\n".join(lines)
+            yield (f"- **Type mismatch** at `{path}`:\n"
+                   f"  - Legacy type: `{diff.get('legacy')}`\n"
+                   f"  - Nextgen type: `{diff.get('nextgen')}`")
 
 
-def format_header_comparison(header_diff: Dict[str, Any]) -> str:
-    """Format header comparison results."""
-    lines = []
-    
-    if header_diff.get('identical'):
-        return "Headers are identical"
+def format_differences(differences: List[Dict[str, Any]], compact_json: bool = False) -> str:
+    """Format list of differences for display."""
+    if not differences:
+        return "No differences"
     
+    return "\n".join(_iter_difference_blocks(differences, compact_json))
+
+
+def _iter_header_sections(header_diff: Dict[str, Any]) -> Iterator[str]:
+    """Yield one markdown section per non-empty group of header changes."""
     added = header_diff.get('added', {})
     removed = header_diff.get('removed', {})
     modified = header_diff.get('modified', {})
     
     if added:
-        lines.append("**Added headers:**")
-        for key, value in added.items():
-            lines.append(f"- `{key}`: `{value}`")
-        lines.append("")
+        yield "**Added headers:**\n" + "\n".join(
+            f"- `{key}`: `{value}`" for key, value in added.items())
     
     if removed:
-        lines.append("**Removed headers:**")
-        for key, value in removed.items():
-            lines.append(f"- `{key}`: `{value}`")
-        lines.append("")
+        yield "**Removed headers:**\n" + "\n".join(
+            f"- `{key}`: `{value}`" for key, value in removed.items())
     
     if modified:
-        lines.append("**Modified headers:**")
-        for key, changes in modified.items():
-            lines.append(f"- `{key}`:")
-            lines.append(f"  - Legacy: `{changes['legacy']}`")
-            lines.append(f"  - Nextgen: `{changes['nextgen']}`")
-        lines.append("")
+        yield "**Modified headers:**\n" + "\n".join(
+            f"- `{key}`:\n"
+            f"  - Legacy: `{changes['legacy']}`\n"
+            f"  - Nextgen: `{changes['nextgen']}`"
+            for key, changes in modified.items())
+
+
+def format_header_comparison(header_diff: Dict[str, Any]) -> str:
+    """Format header comparison results."""
+    if header_diff.get('identical'):
+        return "Headers are identical"
     
-    return "\n".join(lines).strip()
+    # Sections are separated by a blank line
+    return "\n\n".join(_iter_header_sections(header_diff))
@@ -1,8 +1,16 @@
 """HAR file parser for extracting API requests and responses."""
 
 import json
+from itertools import islice
+from operator import itemgetter
+from sys import intern
 from urllib.parse import urlparse, parse_qs
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
 
 
 # Headers to ignore (infrastructure headers that don't affect API behavior)
@@ -25,6 +33,9 @@ IRRELEVANT_HEADERS = {
     'sec-fetch-user', 'upgrade-insecure-requests', 'accept'
 }
 
+# Extracts (name, value) from a HAR header record in one C-level call
+_HEADER_FIELDS = itemgetter('name', 'value')
+
 # Static asset extensions to filter out
 STATIC_ASSET_EXTENSIONS = {
     '.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico',
@@ -56,14 +67,21 @@ def filter_headers(headers: List[Dict[str, str]]) -> Dict[str, str]:
     """Filter out irrelevant headers and return as dictionary."""
     filtered = {}
     for header in headers:
-        name = header.get('name', '').lower()
+        try:
+            name, value = _HEADER_FIELDS(header)
+        except KeyError:
+            name = header.get('name', '')
+            value = header.get('value', '')
+        name = name.lower()
         # Check if header should be ignored
         if any(name.startswith(irrelevant.replace('*', '')) for irrelevant in IRRELEVANT_HEADERS):
             continue
         # Also check exact matches
         if name in IRRELEVANT_HEADERS:
             continue
-        filtered[name] = header.get('value', '')
+        # Interned so the same header name is one shared string across all
+        # entries; dict lookups between header dicts then match by identity
+        filtered[intern(name)] = value
     return filtered
 
 
@@ -114,6 +132,47 @@ def extract_response_body(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     return {'_raw': text, '_mime_type': mime_type}
 
 
+def iter_har_entries(file_path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield raw entries from a HAR file.
+    
+    When ijson is installed the 'log.entries' array is streamed one entry at
+    a time, so peak memory is bounded by the largest entry rather than the
+    whole file. Otherwise the file is loaded with json.load. ijson rejects
+    NaN, Infinity and numbers too large for a float, which json.load
+    accepts, so on a parse error the rest of the file is read with json.load
+    instead.
+    
+    Args:
+        file_path: Path to HAR file
+        
+    Yields:
+        Raw HAR entry dictionaries
+    
+    Raises:
+        ValueError: If the file is not valid JSON
+    """
+    yielded = 0
+    if ijson is not None:
+        with open(file_path, 'rb') as f:
+            try:
+                for entry in ijson.items(f, 'log.entries.item', use_float=True):
+                    yield entry
+                    yielded += 1
+                return
+            except ijson.JSONError:
+                pass
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        try:
+            har_data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in HAR file {file_path}: {e}") from e
+    
+    # Skip entries already streamed before ijson failed
+    yield from islice(har_data.get('log', {}).get('entries', []), yielded, None)
+
+
 def parse_har_file(file_path: str, require_name: bool = False) -> List[Dict[str, Any]]:
     """
     Parse HAR file and extract API requests/responses.
@@ -125,13 +184,9 @@ def parse_har_file(file_path: str, require_name: bool = False) -> List[Dict[str,
     Returns:
         List of API entries with normalized data
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        har_data = json.load(f)
-    
-    entries = har_data.get('log', {}).get('entries', [])
     api_entries = []
     
-    for entry in entries:
+    for entry in iter_har_entries(file_path):
         request = entry.get('request', {})
         url = request.get('url', '')
         
@@ -176,9 +231,10 @@ def parse_har_file(file_path: str, require_name: bool = False) -> List[Dict[str,
             }
         }
         
-        # Add name field if present
+        # Add name field if present (interned: names are the keys matched
+        # between the legacy and nextgen groups)
         if name is not None:
-            api_entry['name'] = name
+            api_entry['name'] = intern(name) if type(name) is str else name
         
         api_entries.append(api_entry)
     
@@ -1,25 +1,27 @@
 """Table generator for API comparison results."""
 
+import html
+import io
 import json
+import re
 from typing import Dict, Any, List
-from urllib.parse import urlparse
 from libs.har_parser import parse_har_file
-from libs.comparison_engine import compare_request_structures, compare_response_structures
+from libs.comparison_engine import compare_request_structures, compare_response_structures, extract_url_path
 from libs.formatter import format_differences, format_header_comparison, format_json_value
 
+# Markdown patterns converted to HTML in table cells
+_CODE_RE = re.compile(r'`([^`<]+)`')
 
-def extract_url_path(url: str) -> str:
-    """Extract path from URL, ignoring hostname and schema."""
-    parsed = urlparse(url)
-    # Return path with query string if present
-    if parsed.query:
-        return f"{parsed.path}?{parsed.query}"
-    return parsed.path
+# **bold** or `code` in one pass. Bold takes precedence: a code span may not
+# contain the start of a bold match, and code inside bold is converted
+# separately, as if all bold were replaced before looking for code.
+_MARKDOWN_RE = re.compile(r'\*\*(.+?)\*\*|`((?:(?!\*\*.+?\*\*)[^`<])+)`')
 
 
-def format_request_for_table(entry: Dict[str, Any]) -> str:
+def format_request_for_table(entry: Dict[str, Any], compact_json: bool = False) -> str:
     """Format request for table cell display."""
     parts = []
+    request = entry.get('request', {})
     
     # URL (only path, no schema/host)
     url = entry.get('original_url', '')
@@ -33,16 +35,16 @@ def format_request_for_table(entry: Dict[str, Any]) -> str:
         parts.append(f"**Method:** `{method}`")
     
     # Headers
-    headers = entry.get('request', {}).get('headers', {})
+    headers = request.get('headers', {})
     if headers:
         parts.append("**Headers:**")
-        parts.append(format_json_value(headers))
+        parts.append(format_json_value(headers, compact=compact_json))
     
     # Body
-    body = entry.get('request', {}).get('body')
+    body = request.get('body')
     if body:
         parts.append("**Body:**")
-        parts.append(format_json_value(body))
+        parts.append(format_json_value(body, compact=compact_json))
     
     if not parts:
         return "*No request data*"
@@ -50,26 +52,27 @@ def format_request_for_table(entry: Dict[str, Any]) -> str:
     return "\n\n".join(parts)
 
 
-def format_response_for_table(entry: Dict[str, Any]) -> str:
+def format_response_for_table(entry: Dict[str, Any], compact_json: bool = False) -> str:
     """Format response for table cell display."""
     parts = []
+    response = entry.get('response', {})
     
     # Status code
-    status = entry.get('response', {}).get('status', 0)
+    status = response.get('status', 0)
     if status:
         parts.append(f"**Status:** `{status}`")
     
     # Headers
-    headers = entry.get('response', {}).get('headers', {})
+    headers = response.get('headers', {})
     if headers:
         parts.append("**Headers:**")
-        parts.append(format_json_value(headers))
+        parts.append(format_json_value(headers, compact=compact_json))
     
     # Body
-    body = entry.get('response', {}).get('body')
+    body = response.get('body')
     if body:
         parts.append("**Body:**")
-        parts.append(format_json_value(body))
+        parts.append(format_json_value(body, compact=compact_json))
     
     if not parts:
         return "*No response data*"
@@ -82,6 +85,7 @@ def format_changes(
     nextgen_entry: Dict[str, Any],
     request_diff: Dict[str, Any] = None,
     response_diff: Dict[str, Any] = None,
+    compact_json: bool = False,
 ) -> str:
     """Format differences as changes for the table."""
     changes = []
@@ -114,7 +118,7 @@ def format_changes(
     # Request body differences
     if request_diff.get('body'):
         changes.append("- **Request Body:**")
-        body_diffs = format_differences(request_diff['body'])
+        body_diffs = format_differences(request_diff['body'], compact_json=compact_json)
         for line in body_diffs.split('\n'):
             if line.strip():
                 changes.append(f"  {line}")
@@ -124,9 +128,10 @@ def format_changes(
         response_diff = compare_response_structures(legacy_entry, nextgen_entry)
     
     # Status code differences
-    if not response_diff['status'].get('identical'):
-        legacy_status = response_diff['status'].get('legacy', 'N/A')
-        nextgen_status = response_diff['status'].get('nextgen', 'N/A')
+    status_diff = response_diff['status']
+    if not status_diff.get('identical'):
+        legacy_status = status_diff.get('legacy', 'N/A')
+        nextgen_status = status_diff.get('nextgen', 'N/A')
         changes.append(f"- **Response Status:** Legacy `{legacy_status}` → Nextgen `{nextgen_status}`")
     
     # Response header differences
@@ -141,7 +146,7 @@ def format_changes(
     # Response body differences
     if response_diff.get('body'):
         changes.append("- **Response Body:**")
-        body_diffs = format_differences(response_diff['body'])
+        body_diffs = format_differences(response_diff['body'], compact_json=compact_json)
         for line in body_diffs.split('\n'):
             if line.strip():
                 changes.append(f"  {line}")
@@ -152,35 +157,52 @@ def format_changes(
     return "\n".join(changes)
 
 
+def _convert_markdown_to_html(line: str) -> str:
+    """Convert markdown formatting to HTML after escaping."""
+    # First escape HTML special characters
+    escaped = html.escape(line)
+    # Then convert markdown to HTML (on the escaped text), skipping
+    # the regex pass when no markers are present
+    if '**' in escaped or '`' in escaped:
+        escaped = _MARKDOWN_RE.sub(_markdown_replacement, escaped)
+    return escaped
+
+
+def _markdown_replacement(match: 're.Match[str]') -> str:
+    """Render one _MARKDOWN_RE match as <strong> or <code>."""
+    bold = match.group(1)
+    if bold is None:
+        return f'<code>{match.group(2)}</code>'
+    # Convert `code` inside bold text (but not inside <code> tags)
+    if '`' in bold:
+        bold = _CODE_RE.sub(r'<code>\1</code>', bold)
+    return f'<strong>{bold}</strong>'
+
+
 def format_cell_content(text: str) -> str:
     """Format text for HTML table cell, preserving code blocks and converting markdown."""
-    import html
-    import re
+    # Without backticks (hence no code fences) or bold markers, every line
+    # only needs escaping
+    if '`' not in text and '**' not in text:
+        return '<br>'.join([html.escape(line) if line.strip() else '' for line in text.split('\n')])
     
-    lines = text.split('\n')
-    result = []
+    buf = io.StringIO()
+    first = True
     in_code_block = False
     code_block_lines = []
     
-    def convert_markdown_to_html(line: str) -> str:
-        """Convert markdown formatting to HTML after escaping."""
-        # First escape HTML special characters
-        escaped = html.escape(line)
-        # Then convert markdown to HTML (on the escaped text)
-        # Convert **bold** to <strong>bold</strong>
-        escaped = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', escaped)
-        # Convert `code` to <code>code</code> (but not inside <code> tags)
-        escaped = re.sub(r'`([^`<]+)`', r'<code>\1</code>', escaped)
-        return escaped
-    
-    for line in lines:
+    for line in text.split('\n'):
         stripped = line.strip()
         if stripped.startswith('```'):
             # End current code block if we're in one
             if in_code_block:
                 # Close the code block
-                code_content = '\n'.join(code_block_lines)
-                result.append(f'<pre><code class="language-json">{html.escape(code_content)}</code></pre>')
+                if not first:
+                    buf.write('<br>')
+                first = False
+                buf.write('<pre><code class="language-json">')
+                buf.write(html.escape('\n'.join(code_block_lines)))
+                buf.write('</code></pre>')
                 code_block_lines = []
                 in_code_block = False
             else:
@@ -190,17 +212,20 @@ def format_cell_content(text: str) -> str:
         elif in_code_block:
             code_block_lines.append(line)
         else:
+            if not first:
+                buf.write('<br>')
+            first = False
             # Regular line - convert markdown to HTML
-            if line.strip():
-                converted = convert_markdown_to_html(line)
-                result.append(converted)
-            else:
-                result.append('')
+            if stripped:
+                buf.write(_convert_markdown_to_html(line))
     
     # Handle case where code block is at the end
     if in_code_block and code_block_lines:
-        code_content = '\n'.join(code_block_lines)
-        result.append(f'<pre><code class="language-json">{html.escape(code_content)}</code></pre>')
+        if not first:
+            buf.write('<br>')
+        buf.write('<pre><code class="language-json">')
+        buf.write(html.escape('\n'.join(code_block_lines)))
+        buf.write('</code></pre>')
     
-    return '<br>'.join(result) if result else ''
+    return buf.getvalue()
 
@@ -1,14 +1,78 @@
 #!/usr/bin/env python3
-"""Script to process all modules and generate separate comparison tables."""
+"""
+Script to process all modules and generate separate comparison tables.
 
+libs/table_helper.py is plain Python that Cython can also compile as is,
+which makes row formatting a few percent faster:
+    cythonize -i -3 libs/table_helper.py
+Remove the built extension module again before editing the source, since
+imports prefer it over the .py file.
+"""
+
+import io
 import os
 import sys
 import html
 import argparse
+import traceback
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Any, Dict, Iterator, List, TextIO, Tuple
 from libs.table_helper import parse_har_file, compare_request_structures, compare_response_structures, format_request_for_table, format_response_for_table, format_cell_content, format_changes
 from libs.har_parser import group_apis_by_name
 
+# Write buffer for output files; tables are written row by row
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Maximum number of rows formatted per worker task when --jobs > 1
+ROW_CHUNK_SIZE = 500
+
+# Title, styles and column headers emitted before the table rows
+_TABLE_HEADER = (
+    "# API Comparison Table",
+    "",
+    "Comparison between Legacy and Nextgen REST APIs",
+    "",
+    '<style>',
+    'table { border-collapse: collapse; width: 100%; }',
+    'th, td { border: 1px solid #ddd; padding: 8px; text-align: left; vertical-align: top; }',
+    'th { background-color: #f2f2f2; }',
+    'pre { margin: 0; overflow-x: auto; }',
+    'code { display: block; white-space: pre; }',
+    '</style>',
+    "",
+    # Use HTML table for better code block support
+    '<table>',
+    '<thead>',
+    '<tr>',
+    '<th>Name</th>',
+    '<th>Legacy Request</th>',
+    '<th>NextGen Request</th>',
+    '<th>Legacy Response</th>',
+    '<th>NextGen Response</th>',
+    '<th>Changes</th>',
+    '</tr>',
+    '</thead>',
+    '<tbody>',
+)
+
+# Emitted instead of the table when the HAR files share no API names
+_NO_COMMON_KEYS = ("# API Comparison Table", "", "No common keys found.", "")
+
+# HTML for one table row, filled once per endpoint
+_ROW_TEMPLATE = (
+    '<tr>\n'
+    '<td>{name}</td>\n'
+    '<td>{legacy_request}</td>\n'
+    '<td>{nextgen_request}</td>\n'
+    '<td>{legacy_response}</td>\n'
+    '<td>{nextgen_response}</td>\n'
+    '<td>{changes}</td>\n'
+    '</tr>'
+)
+
+
 def find_modules(materials_dir: Path) -> list[str]:
     """
     Find all module directories in the materials directory.
@@ -38,7 +102,13 @@ def find_modules(materials_dir: Path) -> list[str]:
     return modules
 
 
-def process_module(module_name: str, materials_dir: Path, output_dir: Path) -> bool:
+def process_module(
+    module_name: str,
+    materials_dir: Path,
+    output_dir: Path,
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> bool:
     """
     Process a single module and generate its comparison table.
     
@@ -46,6 +116,8 @@ def process_module(module_name: str, materials_dir: Path, output_dir: Path) -> b
         module_name: Name of the module
         materials_dir: Path to materials directory
         output_dir: Path to output directory
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
         
     Returns:
         True if successful, False otherwise
@@ -62,15 +134,24 @@ def process_module(module_name: str, materials_dir: Path, output_dir: Path) -> b
         
         # Generate table with name-based matching
         print("  Generating comparison table...")
-        table = generate_comparison_table(
-            str(legacy_file),
-            str(nextgen_file)
-        )
-        
-        # Save table
+        # Stream table row by row to a temporary file next to the report and
+        # move it into place only once complete, so a failed run keeps the
+        # previous report
         output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(table)
+        temp_file = output_file.with_name(f'{output_file.name}.tmp')
+        try:
+            with open(temp_file, 'w', encoding='utf-8', buffering=OUTPUT_BUFFER_SIZE) as f:
+                write_comparison_table(
+                    f,
+                    str(legacy_file),
+                    str(nextgen_file),
+                    compact_json=compact_json,
+                    jobs=jobs,
+                )
+            os.replace(temp_file, output_file)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
         
         print(f"  ✓ Table saved to: {output_file}")
         return True
@@ -80,106 +161,273 @@ def process_module(module_name: str, materials_dir: Path, output_dir: Path) -> b
         return False
     except Exception as e:
         print(f"  ✗ Unexpected error: {e}", file=sys.stderr)
-        import traceback
         traceback.print_exc()
         return False
 
 
-def generate_comparison_table(legacy_file: str, nextgen_file: str) -> str:
+def process_modules(
+    modules: List[str],
+    materials_dir: Path,
+    output_dir: Path,
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> int:
     """
-    Generate markdown table comparing Legacy and NextGen APIs.
+    Process several modules and generate one comparison table for each.
+    
+    Modules are independent, so with jobs > 1 and more than one module they
+    are processed in worker processes, each formatting its rows serially.
+    A single module uses the workers for its rows instead.
+    
+    Args:
+        modules: Names of the modules to process
+        materials_dir: Path to materials directory
+        output_dir: Path to output directory
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes
+        
+    Returns:
+        Number of modules processed successfully
+    """
+    if jobs > 1 and len(modules) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(modules))) as executor:
+            results = executor.map(
+                process_module,
+                modules,
+                repeat(materials_dir),
+                repeat(output_dir),
+                repeat(compact_json),
+            )
+            return sum(results)
+    
+    return sum(
+        process_module(module_name, materials_dir, output_dir, compact_json=compact_json, jobs=jobs)
+        for module_name in modules
+    )
+
+
+def _format_row(legacy_entry: Dict[str, Any], nextgen_entry: Dict[str, Any], compact_json: bool = False) -> str:
+    """
+    Format the HTML table row comparing one Legacy and NextGen endpoint.
+    
+    Args:
+        legacy_entry: Parsed legacy HAR entry
+        nextgen_entry: Parsed nextgen HAR entry
+        compact_json: If True, render JSON cells without indentation
+        
+    Returns:
+        HTML table row
+    """
+    # Compute diffs once for reuse
+    request_diff = compare_request_structures(legacy_entry, nextgen_entry)
+    response_diff = compare_response_structures(legacy_entry, nextgen_entry)
+    name = legacy_entry['name']
+    # Format each column
+    legacy_request = format_request_for_table(legacy_entry, compact_json=compact_json)
+    nextgen_request = format_request_for_table(nextgen_entry, compact_json=compact_json)
+    legacy_response = format_response_for_table(legacy_entry, compact_json=compact_json)
+    nextgen_response = format_response_for_table(nextgen_entry, compact_json=compact_json)
+    changes = format_changes(
+        legacy_entry,
+        nextgen_entry,
+        request_diff=request_diff,
+        response_diff=response_diff,
+        compact_json=compact_json,
+    )
+    
+    # Format for HTML table cells and create table row
+    return _ROW_TEMPLATE.format_map({
+        'name': name,
+        'legacy_request': format_cell_content(legacy_request),
+        'nextgen_request': format_cell_content(nextgen_request),
+        'legacy_response': format_cell_content(legacy_response),
+        'nextgen_response': format_cell_content(nextgen_response),
+        'changes': format_cell_content(changes),
+    })
+
+
+def _format_row_chunk(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]], compact_json: bool = False) -> List[str]:
+    """Format a chunk of endpoint rows; runs in a worker process when --jobs > 1."""
+    return [_format_row(legacy_entry, nextgen_entry, compact_json) for legacy_entry, nextgen_entry in pairs]
+
+
+def iter_comparison_table_lines(
+    legacy_file: str,
+    nextgen_file: str,
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> Iterator[str]:
+    """
+    Generate markdown table comparing Legacy and NextGen APIs line by line.
+    
+    Rows are produced one endpoint at a time so callers can write them out
+    without holding the whole table in memory.
     
     Args:
         legacy_file: Path to legacy HAR file
         nextgen_file: Path to nextgen HAR file
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
         
-    Returns:
-        Markdown formatted table string
+    Yields:
+        Lines of the markdown table, without trailing newlines. Each table
+        row is yielded as a single multi-line string.
     """
     # Parse HAR files
     legacy_entries = parse_har_file(legacy_file)
     nextgen_entries = parse_har_file(nextgen_file)
     
+    yield from iter_comparison_table_lines_from_entries(
+        legacy_entries,
+        nextgen_entries,
+        compact_json=compact_json,
+        jobs=jobs,
+    )
+
+
+def iter_comparison_table_lines_from_entries(
+    legacy_entries: List[Dict[str, Any]],
+    nextgen_entries: List[Dict[str, Any]],
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> Iterator[str]:
+    """
+    Generate markdown table lines from already parsed HAR entries.
+    
+    Same output as iter_comparison_table_lines, for callers that have
+    parsed the HAR files with parse_har_file themselves.
+    
+    Args:
+        legacy_entries: Parsed legacy HAR entries
+        nextgen_entries: Parsed nextgen HAR entries
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
+        
+    Yields:
+        Lines of the markdown table, without trailing newlines
+    """
     # Group by name
     legacy_grouped = group_apis_by_name(legacy_entries)
     nextgen_grouped = group_apis_by_name(nextgen_entries)
     
-    # Find common keys
-    common_keys = set(legacy_grouped.keys()) & set(nextgen_grouped.keys())
+    # Find common keys (set operation directly on the key views; sorted
+    # below since the result is unordered)
+    common_keys = legacy_grouped.keys() & nextgen_grouped.keys()
     
     if not common_keys:
-        return "# API Comparison Table\n\nNo common keys found.\n"
-    
-    lines = []
-    lines.append("# API Comparison Table")
-    lines.append("")
-    lines.append("Comparison between Legacy and Nextgen REST APIs")
-    lines.append("")
-    lines.append('<style>')
-    lines.append('table { border-collapse: collapse; width: 100%; }')
-    lines.append('th, td { border: 1px solid #ddd; padding: 8px; text-align: left; vertical-align: top; }')
-    lines.append('th { background-color: #f2f2f2; }')
-    lines.append('pre { margin: 0; overflow-x: auto; }')
-    lines.append('code { display: block; white-space: pre; }')
-    lines.append('</style>')
-    lines.append("")
+        yield from _NO_COMMON_KEYS
+        return
     
-    # Use HTML table for better code block support
-    lines.append('<table>')
-    lines.append('<thead>')
-    lines.append('<tr>')
-    lines.append('<th>Name</th>')
-    lines.append('<th>Legacy Request</th>')
-    lines.append('<th>NextGen Request</th>')
-    lines.append('<th>Legacy Response</th>')
-    lines.append('<th>NextGen Response</th>')
-    lines.append('<th>Changes</th>')
-    lines.append('</tr>')
-    lines.append('</thead>')
-    lines.append('<tbody>')
-    
-    # Generate rows for each common endpoint
-    for key in sorted(common_keys):
-        legacy_entry = legacy_grouped[key][0]  # Use first occurrence
-        nextgen_entry = nextgen_grouped[key][0]  # Use first occurrence
-        
-        # Compute diffs once for reuse
-        request_diff = compare_request_structures(legacy_entry, nextgen_entry)
-        response_diff = compare_response_structures(legacy_entry, nextgen_entry)
-        name = legacy_entry['name']
-        # Format each column
-        legacy_request = format_request_for_table(legacy_entry)
-        nextgen_request = format_request_for_table(nextgen_entry)
-        legacy_response = format_response_for_table(legacy_entry)
-        nextgen_response = format_response_for_table(nextgen_entry)
-        changes = format_changes(
-            legacy_entry,
-            nextgen_entry,
-            request_diff=request_diff,
-            response_diff=response_diff,
-        )
-        
-        # Format for HTML table cells
-        legacy_request_cell = format_cell_content(legacy_request)
-        nextgen_request_cell = format_cell_content(nextgen_request)
-        legacy_response_cell = format_cell_content(legacy_response)
-        nextgen_response_cell = format_cell_content(nextgen_response)
-        changes_cell = format_cell_content(changes)
+    yield from _TABLE_HEADER
+    
+    # Generate rows for each common endpoint (first occurrence of each name)
+    pairs = [(legacy_grouped[key][0], nextgen_grouped[key][0]) for key in sorted(common_keys)]
+    if jobs > 1 and len(pairs) > 1:
+        chunk_size = min(ROW_CHUNK_SIZE, -(-len(pairs) // jobs))
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for rows in executor.map(_format_row_chunk, chunks, repeat(compact_json)):
+                yield from rows
+    else:
+        for legacy_entry, nextgen_entry in pairs:
+            yield _format_row(legacy_entry, nextgen_entry, compact_json)
+    
+    yield '</tbody>'
+    yield '</table>'
+
+
+def generate_comparison_table(
+    legacy_file: str,
+    nextgen_file: str,
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> str:
+    """
+    Generate markdown table comparing Legacy and NextGen APIs.
+    
+    Args:
+        legacy_file: Path to legacy HAR file
+        nextgen_file: Path to nextgen HAR file
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
         
-        # Create table row
-        lines.append('<tr>')
-        lines.append(f'<td>{name}</td>')
-        lines.append(f'<td>{legacy_request_cell}</td>')
-        lines.append(f'<td>{nextgen_request_cell}</td>')
-        lines.append(f'<td>{legacy_response_cell}</td>')
-        lines.append(f'<td>{nextgen_response_cell}</td>')
-        lines.append(f'<td>{changes_cell}</td>')
-        lines.append('</tr>')
+    Returns:
+        Markdown formatted table string
+    """
+    buf = io.StringIO()
+    write_comparison_table(buf, legacy_file, nextgen_file, compact_json=compact_json, jobs=jobs)
+    return buf.getvalue()
+
+
+def generate_comparison_table_from_entries(
+    legacy_entries: List[Dict[str, Any]],
+    nextgen_entries: List[Dict[str, Any]],
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> str:
+    """
+    Generate markdown table comparing already parsed Legacy and NextGen entries.
+    
+    Lets callers that also need the entries for something else parse each
+    HAR file only once.
     
-    lines.append('</tbody>')
-    lines.append('</table>')
+    Args:
+        legacy_entries: Parsed legacy HAR entries (from parse_har_file)
+        nextgen_entries: Parsed nextgen HAR entries (from parse_har_file)
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
+        
+    Returns:
+        Markdown formatted table string
+    """
+    buf = io.StringIO()
+    _write_lines(buf, iter_comparison_table_lines_from_entries(
+        legacy_entries,
+        nextgen_entries,
+        compact_json=compact_json,
+        jobs=jobs,
+    ))
+    return buf.getvalue()
+
+
+def write_comparison_table(
+    out: TextIO,
+    legacy_file: str,
+    nextgen_file: str,
+    compact_json: bool = False,
+    jobs: int = 1,
+) -> None:
+    """
+    Write markdown table comparing Legacy and NextGen APIs to a text stream.
     
-    return "\n".join(lines)
+    Args:
+        out: Writable text stream (file or io.StringIO)
+        legacy_file: Path to legacy HAR file
+        nextgen_file: Path to nextgen HAR file
+        compact_json: If True, render JSON cells without indentation
+        jobs: Number of worker processes used to format rows
+    """
+    _write_lines(out, iter_comparison_table_lines(legacy_file, nextgen_file, compact_json=compact_json, jobs=jobs))
+
+
+def _write_lines(out: TextIO, lines: Iterator[str]) -> None:
+    """Write lines to out, separated by newlines."""
+    write = out.write
+    for i, line in enumerate(lines):
+        if i:
+            write('\n')
+        write(line)
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for options that take an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
 
 
 def main():
@@ -187,6 +435,8 @@ def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Generate comparison tables for API modules')
     parser.add_argument('--module', '-m', type=str, help='Process only the specified module')
+    parser.add_argument('--compact-json', action='store_true', help='Render JSON cells without indentation (faster for large bodies)')
+    parser.add_argument('--jobs', '-j', type=_positive_int, default=1, help='Number of worker processes; several modules are processed in parallel, a single module formats its rows in parallel (default: 1)')
     args = parser.parse_args()
     
     # Get project root directory
@@ -224,10 +474,7 @@ def main():
         print(f"Found {len(modules)} module(s): {', '.join(modules)}")
     
     # Process each module
-    success_count = 0
-    for module_name in modules:
-        if process_module(module_name, materials_dir, output_dir):
-            success_count += 1
+    success_count = process_modules(modules, materials_dir, output_dir, compact_json=args.compact_json, jobs=args.jobs)
     
     # Print summary
     print(f"\n{'='*60}")